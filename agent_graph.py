@@ -1,14 +1,21 @@
-from typing import TypedDict
+import asyncio
+import re
+from functools import lru_cache
+from typing import Literal, Optional, TypedDict
 from langgraph.graph import StateGraph, END
 from langchain_groq import ChatGroq
-from langchain_core.messages import HumanMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
 from langchain_community.utilities import SQLDatabase
 from langchain_community.agent_toolkits import create_sql_agent
+from pydantic import BaseModel, Field
+from groq import RateLimitError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 import os
 from dotenv import load_dotenv
 
-from tool import get_weather, web_search
-from rag import query_vector_db
+from tool import get_weather_async, web_search
+from rag import SemanticCache, query_vector_db
 from database import engine
 
 load_dotenv()
@@ -16,9 +23,37 @@ load_dotenv()
 # 1. Setup LLM
 llm = ChatGroq(temperature=0, model_name="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
 
-# 2. Setup SQL Agent
+# Bound concurrent Groq calls so request bursts don't trip its rate limits
+LLM_SEM = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_LLM", "8")))
+
+@retry(
+    retry=retry_if_exception_type(RateLimitError),
+    stop=stop_after_attempt(3),
+    wait=wait_exponential_jitter(),
+    reraise=True,
+)
+async def ainvoke_llm(runnable, inputs, config=None):
+    async with LLM_SEM:
+        return await runnable.ainvoke(inputs, config=config)
+
+# 2. Setup SQL Agent (built once at import, reused for every request)
+def _cache_table_info(db: SQLDatabase):
+    """Memoizes schema descriptions, which the SQL agent requests on every run."""
+    get_table_info = db.get_table_info
+
+    @lru_cache(maxsize=32)
+    def cached(table_names):
+        return get_table_info(list(table_names) if table_names is not None else None)
+
+    def get_cached_table_info(table_names=None):
+        return cached(tuple(sorted(table_names)) if table_names is not None else None)
+
+    db.get_table_info = get_cached_table_info
+
 try:
-    db = SQLDatabase(engine)
+    # Keep the FTS virtual/shadow tables out of the agent's schema
+    db = SQLDatabase(engine, include_tables=["meetings"], sample_rows_in_table_info=0, lazy_table_reflection=True)
+    _cache_table_info(db)
     sql_agent_executor = create_sql_agent(llm, db=db, agent_type="openai-tools", verbose=False)
 except Exception as e:
     print(f"Warning: SQL Agent setup failed: {e}")
@@ -28,68 +63,144 @@ except Exception as e:
 class AgentState(TypedDict):
     query: str
     context: str
+    city: Optional[str]
+    sql_query: Optional[str]
     response: str
 
-# 4. Define Nodes (The Agents)
+Category = Literal["WEATHER", "DOC_QA", "MEETING_SCHEDULE", "DB_QUERY"]
+
+class RouteDecision(BaseModel):
+    """Routing category plus the parameters the chosen worker needs."""
+    category: Category
+    city: Optional[str] = Field(None, description="City mentioned in the query, if any")
+    sql_query: Optional[str] = Field(None, description="The question rephrased for the meetings database, if DB_QUERY")
 
-def router_node(state: AgentState):
-    """Decides which worker to call based on the user query."""
-    prompt = f"""Analyze the user query: "{state['query']}"
-Classify it into one of these categories:
+# Prompts are built once with stable system prefixes, so the provider can
+# reuse cached prefix tokens across requests
+ROUTER_SYS = """Classify the user query into one of these categories:
 1. WEATHER: Queries about temperature, rain, forecast, weather
 2. DOC_QA: Queries about policies, resume, document content, information
 3. MEETING_SCHEDULE: Requests to schedule meetings based on conditions
 4. DB_QUERY: Questions about existing meetings, events, database
 
-Return ONLY the category name (WEATHER, DOC_QA, MEETING_SCHEDULE, or DB_QUERY)."""
-    
+Also provide:
+- city: the city name mentioned in the query (for WEATHER or MEETING_SCHEDULE), otherwise null
+- sql_query: for DB_QUERY, the question restated clearly for the meetings database, otherwise null"""
+
+ANSWER_SYS = "Answer the user's question using the provided context."
+
+WEATHER_CHECK_SYS = "You decide whether weather is good for an outdoor meeting. Reply only Yes or No."
+
+ROUTER_CHAIN = ChatPromptTemplate.from_messages([
+    ("system", ROUTER_SYS),
+    ("user", "{query}"),
+]) | llm.with_structured_output(RouteDecision)
+
+ANSWER_CHAIN = ChatPromptTemplate.from_messages([
+    ("system", ANSWER_SYS),
+    ("user", "Context: {context}\n\nQuestion: {query}"),
+]) | llm | StrOutputParser()
+
+WEATHER_CHECK_CHAIN = ChatPromptTemplate.from_messages([
+    ("system", WEATHER_CHECK_SYS),
+    ("user", "Weather is: {weather}"),
+]) | llm | StrOutputParser()
+
+# Only LLM calls tagged as the final answer are streamed to the client
+ANSWER_TAG = "final_answer"
+# Routes are cached by category only, and only for categories whose worker
+# needs no extracted parameters; a near-duplicate query must never reuse
+# another query's city or date.
+route_cache = SemanticCache()
+CACHEABLE_ROUTES = frozenset({"DOC_QA"})
+
+# Keywords used to label SQL agent output
+LIST_KW = frozenset({'list', 'show', 'all', 'get'})
+COUNT_KW = frozenset({'count'})
+SEARCH_KW = frozenset({'search', 'find'})
+WORD_RE = re.compile(r"[a-z]+")
+
+# 4. Define Nodes (The Agents)
+
+async def router_node(state: AgentState):
+    """Decides which worker to call and extracts its parameters in one LLM call."""
     try:
-        response = llm.invoke([HumanMessage(content=prompt)]).content.strip()
+        vec = await asyncio.to_thread(SemanticCache.embed, state['query'])
+        hit, category = route_cache.lookup(vec)
+        if hit:
+            decision = RouteDecision(category=category)
+        else:
+            decision = await ainvoke_llm(ROUTER_CHAIN, {"query": state['query']})
+            if decision.category in CACHEABLE_ROUTES:
+                route_cache.insert(vec, decision.category)
     except Exception as e:
         print(f"Router error: {e}")
-        response = "DB_QUERY"
+        decision = RouteDecision(category="DB_QUERY")
     
-    return {"context": response, "response": ""}
+    return {
+        "context": decision.category,
+        "city": decision.city,
+        "sql_query": decision.sql_query,
+        "response": "",
+    }
 
-def weather_agent(state: AgentState):
+async def weather_agent(state: AgentState):
     """Handles weather-related queries."""
     try:
-        city_prompt = f"Extract the city name from this query: {state['query']}. Reply with only the city name."
-        city_extraction = llm.invoke([HumanMessage(content=city_prompt)]).content.strip()
-        weather = get_weather.invoke(city_extraction)
+        city = state.get('city')
+        if not city:
+            return {"response": "Please mention a city to get the weather for."}
+        weather = await get_weather_async(city)
         return {"response": weather}
     except Exception as e:
         return {"response": f"Weather service unavailable: {str(e)}"}
 
-def doc_qa_agent(state: AgentState):
+# Seconds the vector lookup gets before the web search fallback is started
+WEB_SEARCH_GRACE = float(os.getenv("WEB_SEARCH_GRACE", "0.3"))
+
+async def _delayed_web_search(query: str, doc_missed: asyncio.Event):
+    # Starts when the doc lookup misses or the grace period runs out, whichever
+    # comes first. Cancelling while waiting means no search is sent; once the
+    # thread has started, cancel() can't stop it and the search runs to completion.
+    try:
+        await asyncio.wait_for(doc_missed.wait(), WEB_SEARCH_GRACE)
+    except asyncio.TimeoutError:
+        pass
+    return await asyncio.to_thread(web_search.invoke, query)
+
+async def doc_qa_agent(state: AgentState):
     """Handles document Q&A and web search."""
+    # Overlap the web search fallback with slow vector lookups, but give fast
+    # document hits a head start so they don't trigger a wasted search.
+    doc_task = asyncio.create_task(asyncio.to_thread(query_vector_db, state['query']))
+    doc_missed = asyncio.Event()
+    web_task = asyncio.create_task(_delayed_web_search(state['query'], doc_missed))
     try:
-        doc_result = query_vector_db(state['query'])
+        # query_vector_db only returns context that clears its relevance threshold
+        doc_result = await doc_task
         
         if doc_result:
-            check_prompt = f"Context: {doc_result}\n\nQuestion: {state['query']}\n\nDoes the context answer the question? Reply only Yes or No."
-            check = llm.invoke([HumanMessage(content=check_prompt)]).content.lower()
-            if "yes" in check:
-                ans_prompt = f"Answer this question using the provided context:\n\nContext: {doc_result}\n\nQuestion: {state['query']}"
-                ans = llm.invoke([HumanMessage(content=ans_prompt)])
-                return {"response": ans.content}
+            web_task.cancel()
+            ans = await ainvoke_llm(ANSWER_CHAIN, {"context": doc_result, "query": state['query']}, {"tags": [ANSWER_TAG]})
+            return {"response": ans}
         
-        web_res = web_search.invoke(state['query'])
+        doc_missed.set()
+        web_res = await web_task
         return {"response": web_res}
     except Exception as e:
+        web_task.cancel()
         return {"response": f"Document QA failed: {str(e)}"}
 
-def scheduler_agent(state: AgentState):
+async def scheduler_agent(state: AgentState):
     """Handles meeting scheduling logic."""
     try:
-        # Extract city from query
-        city_prompt = f"Extract the city name from this query: {state['query']}. Reply with only the city name."
-        city = llm.invoke([HumanMessage(content=city_prompt)]).content.strip()
+        city = state.get('city')
+        if not city:
+            return {"response": "Please mention the city where the meeting will take place."}
         
-        weather_res = get_weather.invoke(city)
+        weather_res = await get_weather_async(city)
         
-        decision_prompt = f"Weather is: {weather_res}. Is this good weather for an outdoor meeting? Reply only Yes or No."
-        decision = llm.invoke([HumanMessage(content=decision_prompt)]).content.lower()
+        decision = (await ainvoke_llm(WEATHER_CHECK_CHAIN, {"weather": weather_res})).lower()
         
         if "yes" in decision:
             return {"response": f"Good weather ({weather_res}). Meeting can be scheduled!"}
@@ -98,13 +209,13 @@ def scheduler_agent(state: AgentState):
     except Exception as e:
         return {"response": f"Scheduling error: {str(e)}"}
 
-def db_query_agent(state: AgentState):
+async def db_query_agent(state: AgentState):
     """Handles database queries with optimized formatting and error handling."""
     try:
         if not sql_agent_executor:
             return {"response": "Database service unavailable. Please try another query type."}
         
-        query = state['query'].strip()
+        query = (state.get('sql_query') or state['query']).strip()
         
         # Validate query
         if not query or len(query) < 3:
@@ -112,10 +223,9 @@ def db_query_agent(state: AgentState):
         
         # Execute query with timeout
         try:
-            res = sql_agent_executor.invoke(
-                {"input": query},
-                config={"timeout": 10}
-            )
+            # The agent makes several LLM calls; hold one slot for the whole run
+            async with LLM_SEM:
+                res = await asyncio.wait_for(sql_agent_executor.ainvoke({"input": query}), timeout=10)
         except TimeoutError:
             return {"response": "Database query timed out. Please try a simpler query."}
         
@@ -129,11 +239,13 @@ def db_query_agent(state: AgentState):
         formatted_response = output.strip()
         
         # Add helpful context based on query type
-        if any(word in query.lower() for word in ['list', 'show', 'all', 'get']):
+        lowered = query.lower()
+        tokens = set(WORD_RE.findall(lowered))
+        if tokens & LIST_KW:
             formatted_response = f"Meetings found:\n{formatted_response}"
-        elif any(word in query.lower() for word in ['count', 'how many']):
+        elif tokens & COUNT_KW or "how many" in lowered:
             formatted_response = f"Meeting count:\n{formatted_response}"
-        elif any(word in query.lower() for word in ['search', 'find']):
+        elif tokens & SEARCH_KW:
             formatted_response = f"Search results:\n{formatted_response}"
         
         return {"response": formatted_response}
@@ -159,16 +271,14 @@ workflow.add_node("scheduler_worker", scheduler_agent)
 workflow.add_node("db_worker", db_query_agent)
 
 # Conditional Edges
+WORKERS = {
+    "WEATHER": "weather_worker",
+    "DOC_QA": "doc_worker",
+    "MEETING_SCHEDULE": "scheduler_worker",
+    "DB_QUERY": "db_worker",
+}
 def route_logic(state):
-    category = state.get('context', 'DB_QUERY').upper()
-    if "WEATHER" in category:
-        return "weather_worker"
-    elif "DOC_QA" in category or "DOC" in category:
-        return "doc_worker"
-    elif "MEETING_SCHEDULE" in category or "MEETING" in category:
-        return "scheduler_worker"
-    else:
-        return "db_worker"
+    return WORKERS.get(state.get('context', 'DB_QUERY'), "db_worker")
 
 workflow.set_entry_point("router")
 workflow.add_conditional_edges("router", route_logic)
@@ -1,27 +1,93 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime
+from sqlalchemy import create_engine, text, Column, Integer, String, DateTime
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Optional
 
 DATABASE_URL = "sqlite:///./meetings.db"
 
 Base = declarative_base()
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(
+    DATABASE_URL,
+    query_cache_size=1200,  # Compiled-statement cache entries
+    pool_size=10,
+    max_overflow=20,
+    connect_args={"check_same_thread": False, "timeout": 5},
+)
+SessionFactory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Thread-local sessions, reused instead of constructed per call. Note that all
+# coroutines on the event-loop thread share the same session.
+SessionLocal = scoped_session(SessionFactory)
 
 class Meeting(Base):
     __tablename__ = "meetings"
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
-    start_time = Column(String) # Storing as string for simplicity (YYYY-MM-DD HH:MM)
+    start_time = Column(String, index=True) # Storing as string for simplicity (YYYY-MM-DD HH:MM)
     description = Column(String)
 
+# Full-text index over title/description, kept in sync with meetings by triggers
+FTS_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_meetings_start_time ON meetings (start_time)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS meetings_fts USING fts5(title, description, content='meetings', content_rowid='id')",
+    """CREATE TRIGGER IF NOT EXISTS meetings_ai AFTER INSERT ON meetings BEGIN
+        INSERT INTO meetings_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meetings_ad AFTER DELETE ON meetings BEGIN
+        INSERT INTO meetings_fts(meetings_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS meetings_au AFTER UPDATE ON meetings BEGIN
+        INSERT INTO meetings_fts(meetings_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO meetings_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END""",
+]
+
+def init_search_index():
+    with engine.begin() as conn:
+        exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'meetings_fts'")).first()
+        for stmt in FTS_DDL:
+            conn.execute(text(stmt))
+        if not exists:
+            # Index rows written before the FTS table existed
+            conn.execute(text("INSERT INTO meetings_fts(meetings_fts) VALUES ('rebuild')"))
+
 # Create tables
 Base.metadata.create_all(bind=engine)
+init_search_index()
+
+@contextmanager
+def session_scope(db: Optional[Session] = None):
+    """
+    Provide a session for a unit of work, rolling back on error.
+    
+    A caller-supplied session is used as-is and left open; otherwise the
+    thread-local session is used, and released afterwards only if this
+    scope created it. A scope nested inside another session user on the
+    same thread (including every coroutine on the event-loop thread)
+    therefore leaves the outer session and its pending work alone.
+    """
+    owns_session = db is None and not SessionLocal.registry.has()
+    session = db if db is not None else SessionLocal()
+    try:
+        yield session
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        if owns_session:
+            # Close the session object this scope created, and clear the
+            # registry only if it still holds that same session
+            session.close()
+            if SessionLocal.registry.has() and SessionLocal.registry() is session:
+                SessionLocal.remove()
 
 def get_db():
-    db = SessionLocal()
+    # FastAPI may enter and exit sync generator dependencies on different
+    # threadpool threads, so use an explicit session rather than the
+    # thread-local registry.
+    db = SessionFactory()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -1,10 +1,13 @@
-import shutil
+import asyncio
+import json
 import os
+import aiofiles
 from dotenv import load_dotenv
 from fastapi import FastAPI, UploadFile, File
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from rag import ingest_document
-from agent_graph import app_graph
+from agent_graph import ANSWER_TAG, app_graph
 
 # Load environment variables from .env
 load_dotenv()
@@ -14,21 +17,45 @@ app = FastAPI(title="Agentic AI Backend")
 class QueryRequest(BaseModel):
     query: str
 
-@app.post("/upload")
+class UploadResponse(BaseModel):
+    message: str
+
+@app.post("/upload", response_model=UploadResponse)
 async def upload_document(file: UploadFile = File(...)):
     file_location = f"temp_{file.filename}"
-    with open(file_location, "wb+") as file_object:
-        shutil.copyfileobj(file.file, file_object)
+    async with aiofiles.open(file_location, "wb") as file_object:
+        while chunk := await file.read(1 << 20):
+            await file_object.write(chunk)
     
-    msg = ingest_document(file_location)
-    os.remove(file_location) # Cleanup
+    try:
+        # Parsing and embedding are CPU-bound; keep them off the event loop
+        msg = await asyncio.to_thread(ingest_document, file_location)
+    finally:
+        await asyncio.to_thread(os.remove, file_location) # Cleanup
     return {"message": msg}
 
+def _sse(data: dict) -> str:
+    return f"data: {json.dumps(data)}\n\n"
+
 @app.post("/chat")
 async def chat(request: QueryRequest):
-    # Run the Agent Graph
-    result = app_graph.invoke({"query": request.query})
-    return {"response": result['response']}
+    async def event_stream():
+        streamed = False
+        # Run the Agent Graph, forwarding answer tokens as they are generated
+        async for event in app_graph.astream_events({"query": request.query}, version="v2"):
+            kind = event["event"]
+            if kind == "on_chat_model_stream" and ANSWER_TAG in event.get("tags", []):
+                token = event["data"]["chunk"].content
+                if token:
+                    streamed = True
+                    yield _sse({"token": token})
+            elif kind == "on_chain_end" and not event["parent_ids"]:
+                # Workers that answer without an LLM call send the full response once
+                if not streamed:
+                    yield _sse({"token": event["data"]["output"]["response"]})
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,11 +1,16 @@
 """
 Meeting management module for scheduling and querying meetings.
 """
+import re
+from sqlalchemy import insert, select, text
 from sqlalchemy.orm import Session
-from database import SessionLocal, Meeting
+from database import Meeting, session_scope
 from datetime import datetime
 from typing import List, Optional
 
+# Core projection for list results, skipping ORM hydration
+LIST_SQL = select(Meeting.id, Meeting.title, Meeting.start_time, Meeting.description)
+
 def create_meeting(
     title: str,
     start_time: str,
@@ -19,63 +24,75 @@ def create_meeting(
         title: Meeting title
         start_time: Meeting start time (format: YYYY-MM-DD HH:MM)
         description: Optional meeting description
-        db: Database session (creates new if not provided)
+        db: Database session (uses the thread-local session if not provided)
     
     Returns:
         Dictionary with created meeting details
     """
-    if db is None:
-        db = SessionLocal()
-    
     try:
-        meeting = Meeting(
-            title=title,
-            start_time=start_time,
-            description=description or ""
-        )
-        db.add(meeting)
-        db.commit()
-        db.refresh(meeting)
-        return {
-            "id": meeting.id,
-            "title": meeting.title,
-            "start_time": meeting.start_time,
-            "description": meeting.description
-        }
+        with session_scope(db) as db:
+            meeting = Meeting(
+                title=title,
+                start_time=start_time,
+                description=description or ""
+            )
+            db.add(meeting)
+            db.commit()
+            db.refresh(meeting)
+            return {
+                "id": meeting.id,
+                "title": meeting.title,
+                "start_time": meeting.start_time,
+                "description": meeting.description
+            }
     except Exception as e:
-        db.rollback()
         raise Exception(f"Failed to create meeting: {str(e)}")
-    finally:
-        db.close()
+
+def create_meetings(meetings: List[dict], db: Optional[Session] = None) -> int:
+    """
+    Create several meetings in a single bulk insert.
+    
+    Args:
+        meetings: Dictionaries with title, start_time and optional description
+        db: Database session (uses the thread-local session if not provided)
+    
+    Returns:
+        Number of meetings inserted
+    """
+    if not meetings:
+        return 0
+    
+    try:
+        with session_scope(db) as db:
+            rows = [
+                {
+                    "title": m["title"],
+                    "start_time": m["start_time"],
+                    "description": m.get("description") or ""
+                }
+                for m in meetings
+            ]
+            db.execute(insert(Meeting), rows)
+            db.commit()
+            return len(rows)
+    except Exception as e:
+        raise Exception(f"Failed to create meetings: {str(e)}")
 
 def get_all_meetings(db: Optional[Session] = None) -> List[dict]:
     """
     Retrieve all meetings from the database.
     
     Args:
-        db: Database session (creates new if not provided)
+        db: Database session (uses the thread-local session if not provided)
     
     Returns:
         List of meeting dictionaries
     """
-    if db is None:
-        db = SessionLocal()
-    
     try:
-        meetings = db.query(Meeting).all()
-        return [
-            {
-                "id": m.id,
-                "title": m.title,
-                "start_time": m.start_time,
-                "description": m.description
-            }
-            for m in meetings
-        ]
+        with session_scope(db) as db:
+            return [dict(row) for row in db.execute(LIST_SQL).mappings()]
     except Exception as e:
         raise Exception(f"Failed to retrieve meetings: {str(e)}")
-    finally:
-        db.close()
 
 def get_meeting_by_id(meeting_id: int, db: Optional[Session] = None) -> Optional[dict]:
     """
@@ -83,28 +100,24 @@ def get_meeting_by_id(meeting_id: int, db: Optional[Session] = None) -> Optional
     
     Args:
         meeting_id: Meeting ID
-        db: Database session (creates new if not provided)
+        db: Database session (uses the thread-local session if not provided)
     
     Returns:
         Meeting dictionary or None if not found
     """
-    if db is None:
-        db = SessionLocal()
-    
     try:
-        meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-        if meeting:
-            return {
-                "id": meeting.id,
-                "title": meeting.title,
-                "start_time": meeting.start_time,
-                "description": meeting.description
-            }
-        return None
+        with session_scope(db) as db:
+            meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+            if meeting:
+                return {
+                    "id": meeting.id,
+                    "title": meeting.title,
+                    "start_time": meeting.start_time,
+                    "description": meeting.description
+                }
+            return None
     except Exception as e:
         raise Exception(f"Failed to retrieve meeting: {str(e)}")
-    finally:
-        db.close()
 
 def update_meeting(
     meeting_id: int,
@@ -121,40 +134,35 @@ def update_meeting(
         title: New title (if provided)
         start_time: New start time (if provided)
         description: New description (if provided)
-        db: Database session (creates new if not provided)
+        db: Database session (uses the thread-local session if not provided)
     
     Returns:
         Updated meeting dictionary
     """
-    if db is None:
-        db = SessionLocal()
-    
     try:
-        meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-        if not meeting:
-            raise Exception(f"Meeting {meeting_id} not found")
+        with session_scope(db) as db:
+            meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+            if not meeting:
+                raise Exception(f"Meeting {meeting_id} not found")
         
-        if title:
-            meeting.title = title
-        if start_time:
-            meeting.start_time = start_time
-        if description is not None:
-            meeting.description = description
+            if title:
+                meeting.title = title
+            if start_time:
+                meeting.start_time = start_time
+            if description is not None:
+                meeting.description = description
         
-        db.commit()
-        db.refresh(meeting)
+            db.commit()
+            db.refresh(meeting)
         
-        return {
-            "id": meeting.id,
-            "title": meeting.title,
-            "start_time": meeting.start_time,
-            "description": meeting.description
-        }
+            return {
+                "id": meeting.id,
+                "title": meeting.title,
+                "start_time": meeting.start_time,
+                "description": meeting.description
+            }
     except Exception as e:
-        db.rollback()
         raise Exception(f"Failed to update meeting: {str(e)}")
-    finally:
-        db.close()
 
 def delete_meeting(meeting_id: int, db: Optional[Session] = None) -> bool:
     """
@@ -162,81 +170,67 @@ def delete_meeting(meeting_id: int, db: Optional[Session] = None) -> bool:
     
     Args:
         meeting_id: Meeting ID
-        db: Database session (creates new if not provided)
+        db: Database session (uses the thread-local session if not provided)
     
     Returns:
         True if deleted, False if not found
     """
-    if db is None:
-        db = SessionLocal()
-    
     try:
-        meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
-        if not meeting:
-            return False
+        with session_scope(db) as db:
+            meeting = db.query(Meeting).filter(Meeting.id == meeting_id).first()
+            if not meeting:
+                return False
         
-        db.delete(meeting)
-        db.commit()
-        return True
+            db.delete(meeting)
+            db.commit()
+            return True
     except Exception as e:
-        db.rollback()
         raise Exception(f"Failed to delete meeting: {str(e)}")
-    finally:
-        db.close()
+
+SEARCH_SQL = text(
+    "SELECT m.id, m.title, m.start_time, m.description FROM meetings m JOIN meetings_fts f ON f.rowid = m.id "
+    "WHERE meetings_fts MATCH :q ORDER BY f.rank"
+)
+
+def _fts_query(query: str) -> str:
+    """Quote each word as a prefix term so user input can't break FTS syntax."""
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", query))
 
 def search_meetings(query: str, db: Optional[Session] = None) -> List[dict]:
     """
-    Search meetings by title or description.
+    Search meetings by title or description using the full-text index.
     
     Args:
         query: Search query string
-        db: Database session (creates new if not provided)
+        db: Database session (uses the thread-local session if not provided)
     
     Returns:
         List of matching meeting dictionaries
     """
-    if db is None:
-        db = SessionLocal()
-    
     try:
-        meetings = db.query(Meeting).filter(
-            (Meeting.title.ilike(f"%{query}%")) |
-            (Meeting.description.ilike(f"%{query}%"))
-        ).all()
-        
-        return [
-            {
-                "id": m.id,
-                "title": m.title,
-                "start_time": m.start_time,
-                "description": m.description
-            }
-            for m in meetings
-        ]
+        with session_scope(db) as db:
+            match = _fts_query(query)
+            if not match:
+                return []
+            return [dict(row) for row in db.execute(SEARCH_SQL, {"q": match}).mappings()]
     except Exception as e:
         raise Exception(f"Failed to search meetings: {str(e)}")
-    finally:
-        db.close()
 
 def count_meetings(db: Optional[Session] = None) -> int:
     """
     Count total number of meetings.
     
     Args:
-        db: Database session (creates new if not provided)
+        db: Database session (uses the thread-local session if not provided)
     
     Returns:
         Total meeting count
     """
-    if db is None:
-        db = SessionLocal()
-    
     try:
-        return db.query(Meeting).count()
+        with session_scope(db) as db:
+            return db.query(Meeting).count()
     except Exception as e:
         raise Exception(f"Failed to count meetings: {str(e)}")
-    finally:
-        db.close()
 
 def format_meeting_list(meetings: List[dict]) -> str:
     """
@@ -1,25 +1,190 @@
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+import hashlib
+import os
+import threading
+
+import numpy as np
+import pypdfium2 as pdfium
+import semchunk
+import tiktoken
+from langchain_core.documents import Document
 from langchain_community.vectorstores import Chroma
+from langchain_community.vectorstores.utils import maximal_marginal_relevance
 from langchain_community.embeddings import HuggingFaceEmbeddings
 
-# Initialize simple embedding model (runs locally)
-embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
+# Initialize simple embedding model (runs locally). The default ONNX backend
+# loads the INT8-quantized MiniLM export shipped in the model repo; set
+# EMBEDDING_BACKEND=torch to fall back to eager PyTorch.
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "onnx")
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+
+model_kwargs = {"backend": EMBEDDING_BACKEND}
+if EMBEDDING_BACKEND == "onnx":
+    model_kwargs["model_kwargs"] = {"file_name": EMBEDDING_ONNX_FILE}
+else:
+    import torch
+    model_kwargs["device"] = "cuda" if torch.cuda.is_available() else "cpu"
+
+embeddings = HuggingFaceEmbeddings(
+    model_name="all-MiniLM-L6-v2",
+    model_kwargs=model_kwargs,
+    encode_kwargs={"batch_size": 64, "normalize_embeddings": True},
+)
+
+if EMBEDDING_BACKEND != "onnx":
+    # Half precision halves memory traffic per forward pass
+    if model_kwargs["device"] == "cuda":
+        embeddings.client.half()
+    else:
+        embeddings.client.to(torch.bfloat16)
+
+# Pay model loading / session setup once at startup, not on the first request
+embeddings.embed_query("warmup")
+
+# Reload the persisted index so warm boots skip re-embedding
+PERSIST_DIR = "./chroma_store"
 vector_store = None
+if os.path.isdir(PERSIST_DIR):
+    vector_store = Chroma(persist_directory=PERSIST_DIR, embedding_function=embeddings)
+
+class SemanticCache:
+    """Caches values by query embedding, returning hits above a cosine threshold."""
+
+    def __init__(self, threshold: float = 0.95, maxsize: int = 1024):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.cache_vecs = None
+            self.cache_vals = []
+            self._last_used = np.zeros(self.maxsize, dtype=np.int64)
+            self._clock = 0
+
+    @staticmethod
+    def embed(query: str) -> np.ndarray:
+        # Normalize once so similarity is a plain dot product
+        vec = np.asarray(embeddings.embed_query(query), dtype=np.float32)
+        return vec / (np.linalg.norm(vec) or 1.0)
+
+    def lookup(self, vec: np.ndarray):
+        """Returns (True, value) on a hit, (False, None) otherwise."""
+        with self._lock:
+            size = len(self.cache_vals)
+            if not size:
+                return False, None
+            sims = self.cache_vecs[:size] @ vec
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return False, None
+            self._clock += 1
+            self._last_used[best] = self._clock
+            return True, self.cache_vals[best]
+
+    def insert(self, vec: np.ndarray, value):
+        with self._lock:
+            if self.cache_vecs is None:
+                self.cache_vecs = np.empty((self.maxsize, vec.shape[0]), dtype=np.float32)
+            size = len(self.cache_vals)
+            if size < self.maxsize:
+                slot = size
+                self.cache_vals.append(value)
+            else:
+                # Evict the least recently used entry
+                slot = int(np.argmin(self._last_used))
+                self.cache_vals[slot] = value
+            self.cache_vecs[slot] = vec
+            self._clock += 1
+            self._last_used[slot] = self._clock
+
+retrieval_cache = SemanticCache()
+
+# Token-based chunking; 250 tokens is roughly the previous 1000 characters
+CHUNK_SIZE = 250
+CHUNK_OVERLAP = 25
+chunker = semchunk.chunkerify(tiktoken.get_encoding("cl100k_base"), CHUNK_SIZE)
+
+def split_documents(docs):
+    splits = []
+    for doc in docs:
+        for chunk in chunker(doc.page_content, overlap=CHUNK_OVERLAP):
+            splits.append(Document(page_content=chunk, metadata=doc.metadata))
+    return splits
+
+# Minimum cosine similarity of the best chunk for the context to be used at all
+RELEVANCE_THRESHOLD = 0.55
+# Candidates fetched per query for the relevance gate and MMR re-ranking
+FETCH_K = 12
+
+def load_pdf(file_path: str):
+    """Extracts one Document per page using PDFium's native text extraction."""
+    pdf = pdfium.PdfDocument(file_path)
+    try:
+        docs = []
+        for i, page in enumerate(pdf):
+            textpage = page.get_textpage()
+            docs.append(Document(
+                page_content=textpage.get_text_range(),
+                metadata={"source": file_path, "page": i},
+            ))
+            textpage.close()
+            page.close()
+        return docs
+    finally:
+        pdf.close()
 
 def ingest_document(file_path: str):
     global vector_store
-    loader = PyPDFLoader(file_path)
-    docs = loader.load()
-    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-    splits = splitter.split_documents(docs)
+    docs = load_pdf(file_path)
+    splits = split_documents(docs)
+    
+    # Deterministic ids per file/page/chunk, so re-ingesting a file replaces
+    # its chunks instead of storing them twice
+    ids = [
+        hashlib.sha256(f"{d.metadata['source']}:{d.metadata['page']}:{i}".encode()).hexdigest()
+        for i, d in enumerate(splits)
+    ]
     
     # Create/Update Vector Store
-    vector_store = Chroma.from_documents(documents=splits, embedding=embeddings)
+    if vector_store is None:
+        vector_store = Chroma.from_documents(documents=splits, embedding=embeddings, ids=ids, persist_directory=PERSIST_DIR)
+    else:
+        # Drop the file's previous chunks first, in case it now has fewer
+        stale = vector_store.get(where={"source": file_path})["ids"]
+        if stale:
+            vector_store.delete(ids=stale)
+        vector_store.add_documents(splits, ids=ids)
+    vector_store.persist()
+    # Cached retrievals refer to the previous store
+    retrieval_cache.clear()
     return "Document processed successfully."
 
 def query_vector_db(query: str):
     if not vector_store:
         return None
-    results = vector_store.similarity_search(query, k=3)
-    return "\n".join([doc.page_content for doc in results])
\ No newline at end of file
+    vec = SemanticCache.embed(query)
+    hit, cached = retrieval_cache.lookup(vec)
+    if hit:
+        return cached
+    # A single collection query returns the candidates' stored embeddings, so
+    # both the relevance gate and MMR are computed from it. LangChain's Chroma
+    # wrapper offers scored search or MMR but not both from one query, and its
+    # scores are raw distances that would need converting.
+    found = vector_store._collection.query(
+        query_embeddings=[vec.tolist()],
+        n_results=FETCH_K,
+        include=["documents", "embeddings"],
+    )
+    docs = found["documents"][0]
+    result = None
+    if docs:
+        candidates = np.asarray(found["embeddings"][0], dtype=np.float32)
+        sims = candidates @ vec / np.linalg.norm(candidates, axis=1)
+        # Weak best matches return None so the caller falls through to web search
+        if sims.max() >= RELEVANCE_THRESHOLD:
+            # MMR drops near-duplicate chunks, keeping the LLM context short
+            picked = maximal_marginal_relevance(vec, candidates, k=3, lambda_mult=0.5)
+            result = "\n".join(docs[i] for i in picked)
+    retrieval_cache.insert(vec, result)
+    return result
@@ -1,24 +1,68 @@
 import os
-import requests
+import threading
+import httpx
+from cachetools import TTLCache
+from ddgs import DDGS
+from ddgs.exceptions import DDGSException, TimeoutException
 from langchain.tools import tool
-from langchain_community.tools import DuckDuckGoSearchRun
 from dotenv import load_dotenv
 
 load_dotenv()
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
+WEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
+
+# Shared HTTP/2 clients so connections are reused and multiplexed across calls
+_limits = httpx.Limits(max_keepalive_connections=20)
+_session = httpx.Client(http2=True, limits=_limits, timeout=5.0)
+_async_client = httpx.AsyncClient(http2=True, limits=_limits, timeout=5.0)
+_search = DDGS()
+
+# Successful lookups are reused for 10 minutes, keyed on the lowercased city
+_weather_cache = TTLCache(maxsize=256, ttl=600)
+_weather_lock = threading.Lock()
+
+def _weather_params(city: str):
+    return {"q": city, "appid": OPENWEATHER_API_KEY, "units": "metric"}
+
+def _cache_weather(key: str, data: dict):
+    weather = f"Weather in {key.title()}: {data['weather'][0]['description']}, Temp: {data['main']['temp']}°C"
+    with _weather_lock:
+        _weather_cache[key] = weather
+    return weather
+
+def _cached_weather(key: str):
+    with _weather_lock:
+        return _weather_cache.get(key)
 
 @tool
 def get_weather(city: str):
     """Fetches current weather for a specific city."""
-    url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={OPENWEATHER_API_KEY}&units=metric"
-    response = requests.get(url)
+    key = city.strip().lower()
+    cached = _cached_weather(key)
+    if cached:
+        return cached
+    response = _session.get(WEATHER_URL, params=_weather_params(key))
+    if response.status_code == 200:
+        return _cache_weather(key, response.json())
+    return "Could not fetch weather data."
+
+async def get_weather_async(city: str):
+    """Fetches current weather for a specific city without blocking the event loop."""
+    key = city.strip().lower()
+    cached = _cached_weather(key)
+    if cached:
+        return cached
+    response = await _async_client.get(WEATHER_URL, params=_weather_params(key))
     if response.status_code == 200:
-        data = response.json()
-        return f"Weather in {city}: {data['weather'][0]['description']}, Temp: {data['main']['temp']}°C"
+        return _cache_weather(key, response.json())
     return "Could not fetch weather data."
 
 @tool
 def web_search(query: str):
     """Searches the web for general knowledge."""
-    search = DuckDuckGoSearchRun()
-    return search.run(query)
\ No newline at end of file
+    try:
+        results = _search.text(query, max_results=5)
+    except (DDGSException, TimeoutException):
+        # ddgs raises instead of returning an empty list when nothing is found
+        return "No good search result found."
+    return " ".join(r["body"] for r in results)